@@ -0,0 +1,36 @@
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+# Disk cache shared by every request on this host, keyed by content hash
+CACHE_DIR = Path(os.getenv("PPT2DOC_CACHE_DIR", Path(tempfile.gettempdir()) / "ppt2doc-cache"))
+HASH_CHUNK_SIZE = 64 * 1024
+
+def compute_file_hash(path: Path) -> str:
+    """SHA-256 of a file's bytes, read in 64 KiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def compute_text_hash(*parts: str) -> str:
+    """SHA-256 of the given strings joined with '|'."""
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+def load(key: str):
+    """Return the cached value for key, or None on a miss."""
+    try:
+        with open(CACHE_DIR / f"{key}.json", "r", encoding="utf-8") as f:
+            return json.load(f)["value"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+def store(key: str, value) -> None:
+    """Write value to the cache, atomically replacing any previous entry."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+        json.dump({"value": value}, f)
+    os.replace(f.name, CACHE_DIR / f"{key}.json")
@@ -1,17 +1,22 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+import asyncio
 import tempfile
 import os
 from pathlib import Path
 import json
 from typing import List, Dict
+import aiofiles
 import uvicorn
 
-from pipeline import process_deck
+from pipeline import process_deck, start_soffice_server, stop_soffice_server, stop_ocr_pool, load_token_encoding
 
 app = FastAPI(title="Slide Summarizer API")
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,13 +26,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep one LibreOffice running for the lifetime of the server so conversions
+# skip its multi-second start-up
+@app.on_event("startup")
+async def startup():
+    start_soffice_server()
+    # Fetch the tokenizer in the background rather than during the first deck
+    asyncio.get_running_loop().run_in_executor(None, load_token_encoding)
+
+@app.on_event("shutdown")
+async def shutdown():
+    stop_soffice_server()
+    stop_ocr_pool()
+
 @app.post("/summarize")
 async def summarize_slides(
     file: UploadFile = File(...),
     provider: str = Form(...),
     style: str = Form(...),
     openai_key: str = Form(None),
-    gemini_key: str = Form(None)
+    gemini_key: str = Form(None),
+    batch: bool = Form(False)
 ):
     try:
         # Validate API keys based on provider
@@ -36,30 +55,42 @@ async def summarize_slides(
         if provider == "gemini" and not gemini_key:
             raise HTTPException(status_code=400, detail="Gemini API key is required")
 
-        # Create a temporary directory for processing
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Save uploaded file
-            file_path = temp_path / file.filename
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
+        # Create a temporary directory for processing; it has to outlive this
+        # handler, so the response stream removes it once it is done
+        temp_dir = tempfile.TemporaryDirectory()
+        temp_path = Path(temp_dir.name)
+        
+        # Stream uploaded file to disk without holding it in memory
+        file_path = temp_path / file.filename
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
             
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Send each slide as one NDJSON line as soon as it is summarized. The status
+    # line has already gone out by the time processing fails, so failures are
+    # reported as a final {"error": ...} line instead
+    async def stream_results():
+        try:
             # Process the deck with user-provided API keys
-            results = process_deck(
+            async for result in process_deck(
                 deck_path=str(file_path),
                 work_dir=str(temp_path),
                 provider=provider,
                 style=style,
                 openai_key=openai_key,
-                gemini_key=gemini_key
-            )
-            
-            return JSONResponse(content=results)
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+                gemini_key=gemini_key,
+                batch=batch
+            ):
+                yield json.dumps(result) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            temp_dir.cleanup()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
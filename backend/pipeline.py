@@ -1,113 +1,728 @@
+import io
 import os
+import re
+import json
+import logging
+import base64
 import sys
-import time
+import asyncio
+import tempfile
+import functools
+import threading
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
 from dotenv import load_dotenv
 
 from pdf2image import convert_from_path
+import pypdfium2 as pdfium
 from PIL import Image
 import pytesseract
+import tiktoken
 
 import openai
-import google.generativeai as genai
-from openai.error import RateLimitError
+import google.ai.generativelanguage as glm
+from aiolimiter import AsyncLimiter
+from google.api_core.exceptions import ResourceExhausted
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
-def process_deck(deck_path: str, work_dir: str, provider: str, style: str, openai_key: str = None, gemini_key: str = None):
-    """Process a PowerPoint deck and return summaries."""
+import cache
+
+# Python-UNO ships with LibreOffice and is only importable under its interpreter
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+logger = logging.getLogger(__name__)
+
+MODEL_OPENAI = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+MODEL_GEMINI = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+# Per-provider request throttling: max in-flight requests and requests per minute
+PROVIDER_LIMITS = {
+    "openai": {
+        "max_concurrency": int(os.getenv("OPENAI_MAX_CONCURRENCY", os.getenv("LLM_MAX_CONCURRENCY", 10))),
+        "rpm": int(os.getenv("OPENAI_RPM", 500)),
+    },
+    "gemini": {
+        "max_concurrency": int(os.getenv("GEMINI_MAX_CONCURRENCY", os.getenv("LLM_MAX_CONCURRENCY", 10))),
+        "rpm": int(os.getenv("GEMINI_RPM", 60)),
+    },
+}
+SEMAPHORES = {name: asyncio.Semaphore(cfg["max_concurrency"]) for name, cfg in PROVIDER_LIMITS.items()}
+LIMITERS = {name: AsyncLimiter(cfg["rpm"], 60) for name, cfg in PROVIDER_LIMITS.items()}
+
+# Bounds on every LLM call: a 2-3 sentence summary fits well under 200 tokens,
+# and a low temperature keeps replies stable enough to be worth caching
+LLM_TIMEOUT = 30.0
+LLM_MAX_RETRIES = 3
+LLM_TEMPERATURE = 0.2
+SUMMARY_MAX_TOKENS = 200
+
+# Slides packed into one summarization request, and reply budget per slide
+BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 8))
+BATCH_MAX_TOKENS_PER_SLIDE = 256
+SUMMARY_HEADER = re.compile(r"^\s*###\s*Summary\s+(\d+)\s*$", re.MULTILINE)
+
+# Slide text sent to the LLM is capped at this many tokens. tiktoken downloads
+# the encoding on first use (point TIKTOKEN_CACHE_DIR at a copy on offline hosts);
+# if it can't be loaded, the cap falls back to roughly 4 characters per token
+MAX_SLIDE_TOKENS = 1500
+MAX_SLIDE_CHARS = MAX_SLIDE_TOKENS * 4
+
+# Pages whose text layer has fewer characters than this are treated as scans and OCR'd
+MIN_TEXT_LAYER_CHARS = 20
+
+# Streaming pipeline: pages are rendered a chunk at a time, each OCR worker takes a
+# few pages per Tesseract run, and bounded queues between stages apply backpressure
+OCR_WORKERS = os.cpu_count() or 1
+OCR_BATCH_SIZE = 4
+RENDER_CHUNK = OCR_WORKERS * OCR_BATCH_SIZE
+
+# One OCR process pool shared by every request, so shutting it down never
+# stalls the event loop (and concurrent decks don't each spawn OCR_WORKERS processes)
+_ocr_pool = None
+
+# OCR input is capped at OCR_MAX_EDGE px and thresholded to 1-bit; slides are a
+# single uniform block of text, so page layout analysis (psm 3) is skipped
+OCR_MAX_EDGE = 2000
+OCR_THRESHOLD = 180
+TESSERACT_CONFIG = "--psm 6 -c preserve_interword_spaces=1"
+
+# Thumbnails returned to clients are inlined as small WebP data URLs
+THUMBNAIL_SIZE = (400, 300)
+THUMBNAIL_QUALITY = 70
+
+# Long-lived LibreOffice instance driven over UNO, plus a warm profile for the
+# one-shot subprocess fallback so its font cache and bootstrap are reused.
+# A profile can only be used by one soffice at a time (a second one exits 0
+# without converting), so fallback runs are serialized on a lock
+SOFFICE_PORT = int(os.getenv("SOFFICE_PORT", 2202))
+SOFFICE_WARM_PROFILE = "file:///tmp/lo_warm"
+_SOFFICE_FALLBACK_LOCK = threading.Lock()
+_soffice_server = None
+
+# PDFium is not thread-safe and pypdfium2 does not serialize calls, so every
+# pdfium call, from any request's thread, is made while holding this lock
+_PDFIUM_LOCK = threading.Lock()
+
+# Batch API jobs are polled with exponential backoff between these bounds (seconds)
+BATCH_POLL_INITIAL = 5
+BATCH_POLL_MAX = 60
+
+# Back off and retry when Gemini reports rate limiting or times out. OpenAI 429s
+# are left to the client's own max_retries so the two backoffs don't stack
+retry_on_rate_limit = retry(
+    retry=retry_if_exception_type((ResourceExhausted, asyncio.TimeoutError)),
+    wait=wait_random_exponential(multiplier=1, max=60),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+
+async def process_deck(deck_path: str, work_dir: str, provider: str, style: str, openai_key: str = None, gemini_key: str = None, use_cache: bool = True, batch: bool = False):
+    """Process a PowerPoint deck, yielding each slide's summary as soon as it is ready.
+    
+    Rendering, OCR and summarization run as concurrent stages connected by
+    bounded queues, so early slides are summarized while later ones render.
+    Pages with a real PDF text layer skip rendering and OCR entirely.
+    Slides are yielded in completion order; use "slide_number" to place them.
+    With batch=True and the OpenAI provider, summaries go through the Batch API
+    (half price, but nothing is yielded until the whole job is done).
+    """
     work_path = Path(work_dir)
     deck_path = Path(deck_path)
     
-    # Convert PPT to PDF
-    pdf_path = pptx_to_pdf(deck_path, work_path)
+    # Convert PPT to PDF (blocking subprocess, keep it off the event loop);
+    # the tokenizer is fetched alongside so clean_ocr never loads it on the loop
+    pdf_path, _ = await asyncio.gather(
+        asyncio.to_thread(pptx_to_pdf, deck_path, work_path),
+        asyncio.to_thread(load_token_encoding)
+    )
+    
+    # Machine-generated slides carry a text layer; only near-empty pages need OCR
+    layer = await asyncio.to_thread(extract_text_from_pdf, pdf_path)
+    page_count = len(layer)
+    needs_ocr = [i for i, text in enumerate(layer) if len(text.strip()) < MIN_TEXT_LAYER_CHARS]
+    
+    # Thumbnails render in the background, one future per page, so a slide goes out
+    # as soon as its own thumbnail is ready; pages that fail to render get None
+    loop = asyncio.get_running_loop()
+    thumbnails = [loop.create_future() for _ in range(page_count)]
+    
+    def set_thumbnail(i: int, thumbnail: Optional[str]) -> None:
+        if not thumbnails[i].done():
+            thumbnails[i].set_result(thumbnail)
+    
+    def finish_thumbnails(_) -> None:
+        for i in range(page_count):
+            set_thumbnail(i, None)
+    
+    # Set when the request ends, so a disconnected client's deck stops rendering
+    stop_thumbnails = threading.Event()
+    thumbnailer = asyncio.create_task(asyncio.to_thread(
+        render_thumbnails, pdf_path, lambda i, url: loop.call_soon_threadsafe(set_thumbnail, i, url), stop_thumbnails
+    ))
+    thumbnailer.add_done_callback(finish_thumbnails)
+    
+    image_paths = [None] * page_count
+    normalized = [None] * page_count
+    
+    model = MODEL_OPENAI if provider == "openai" else MODEL_GEMINI
+    api_key = openai_key if provider == "openai" else gemini_key
+    use_batch_api = batch and provider == "openai"
+    llm_workers = PROVIDER_LIMITS[provider]["max_concurrency"]
     
-    # Convert PDF to images
-    image_paths = pdf_to_images(pdf_path, work_path)
+    # Workers only batch what is already queued, so llm_q must hold a full batch for each
+    ocr_q = asyncio.Queue(maxsize=RENDER_CHUNK)
+    llm_q = asyncio.Queue(maxsize=max(RENDER_CHUNK, BATCH_SIZE * llm_workers))
+    summaries = {}
+    deferred = []
+    waiting = {}
+    out_q = asyncio.Queue()
     
-    results = []
-    for i, image_path in enumerate(image_paths, 1):
-        # Extract text from image
-        text = extract_text(image_path)
+    def record(texts: list[str], results: list) -> None:
+        for text, summary in zip(texts, results):
+            summaries[text] = summary
+            if use_cache and not isinstance(summary, Exception):
+                cache.store(summary_cache_key(text, provider, model, style), summary)
+            for i in waiting.pop(text, []):
+                out_q.put_nowait(i)
+    
+    async def text_layer_producer():
+        for i, text in enumerate(layer):
+            if len(text.strip()) >= MIN_TEXT_LAYER_CHARS:
+                normalized[i] = clean_ocr(text)
+                await llm_q.put(i)
+    
+    async def render_producer():
+        # Render runs of consecutive pages (Poppler threads in parallel within a run)
+        for first, last in _page_runs(needs_ocr, RENDER_CHUNK):
+            paths = await asyncio.to_thread(pdf_to_images, pdf_path, work_path, first + 1, last + 1)
+            for i, path in enumerate(paths, first):
+                image_paths[i] = path
+                await ocr_q.put(i)
+        for _ in range(OCR_WORKERS):
+            await ocr_q.put(None)
+    
+    async def ocr_worker(pool):
+        while True:
+            pages, done = await _next_batch(ocr_q, OCR_BATCH_SIZE)
+            if pages:
+                texts = await ocr_batch([image_paths[i] for i in pages], pool, use_cache)
+                for i, text in zip(pages, texts):
+                    # Cleaned text is also the dedupe key, so OCR-noise-equivalent slides share one summary
+                    normalized[i] = clean_ocr(text)
+                    await llm_q.put(i)
+            if done:
+                return
+    
+    async def llm_worker():
+        while True:
+            pages, done = await _next_batch(llm_q, BATCH_SIZE)
+            
+            # Each distinct text is summarized once, by whichever worker sees it first,
+            # and reused from the cache if an earlier deck already produced it
+            new = [text for text in dict.fromkeys(normalized[i] for i in pages) if text not in summaries]
+            for text in new:
+                summaries[text] = cache.load(summary_cache_key(text, provider, model, style)) if use_cache else None
+            misses = [text for text in new if summaries[text] is None]
+            
+            # Slides already summarized go out now, the rest once their text is
+            for i in pages:
+                if summaries[normalized[i]] is not None:
+                    out_q.put_nowait(i)
+                else:
+                    waiting.setdefault(normalized[i], []).append(i)
+            
+            if use_batch_api:
+                deferred.extend(misses)
+            elif misses:
+                try:
+                    record(misses, await summarize_batch(misses, provider, api_key, style))
+                except Exception as e:
+                    record(misses, [e] * len(misses))
+            if done:
+                return
+    
+    async def ocr_stage():
+        pool = ocr_pool()
+        await asyncio.gather(*(ocr_worker(pool) for _ in range(OCR_WORKERS)))
+    
+    async def close_llm_q(producers):
+        await asyncio.gather(*producers)
+        for _ in range(llm_workers):
+            await llm_q.put(None)
+    
+    async def run_stages():
+        # Text-layer pages and scanned pages feed llm_q side by side, so a long
+        # text-layer run can't hold back rendering while llm_q is full
+        producers = [
+            asyncio.create_task(text_layer_producer()),
+            asyncio.create_task(render_producer()),
+            asyncio.create_task(ocr_stage())
+        ]
+        stages = [
+            *producers,
+            asyncio.create_task(close_llm_q(producers)),
+            *(asyncio.create_task(llm_worker()) for _ in range(llm_workers))
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for task in stages:
+                task.cancel()
+            raise
         
-        # Generate summary based on provider
-        if provider == "openai":
-            summary = summarize_openai(text, openai_key, style)
+        if deferred:
+            try:
+                record(deferred, await summarize_openai_batch(deferred, api_key, style))
+            except Exception as e:
+                record(deferred, [e] * len(deferred))
+    
+    runner = asyncio.create_task(run_stages())
+    runner.add_done_callback(lambda _: out_q.put_nowait(None))
+    try:
+        while (i := await out_q.get()) is not None:
+            summary = summaries[normalized[i]]
+            if isinstance(summary, Exception):
+                summary = f"[Error summarizing slide: {summary}]"
+            yield {
+                "slide_number": i + 1,
+                "summary": summary,
+                "thumbnail": await thumbnails[i]
+            }
+        # Re-raise any failure from the stages once everything emitted has been yielded
+        await runner
+    finally:
+        runner.cancel()
+        stop_thumbnails.set()
+        thumbnailer.cancel()
+
+def _page_runs(pages: list[int], max_len: int) -> list[tuple[int, int]]:
+    """Group sorted page indices into (first, last) runs of consecutive pages, at most max_len long."""
+    runs = []
+    for i in pages:
+        if runs and runs[-1][1] == i - 1 and i - runs[-1][0] < max_len:
+            runs[-1] = (runs[-1][0], i)
         else:
-            summary = summarize_gemini(text, gemini_key, style)
-        
-        # Add result
-        results.append({
-            "slide_number": i,
-            "summary": summary,
-            "thumbnail": str(image_path)
-        })
+            runs.append((i, i))
+    return runs
+
+async def _next_batch(queue: asyncio.Queue, limit: int) -> tuple[list, bool]:
+    """Wait for the next item, then take up to limit items that are already queued.
     
-    return results
+    Returns the items and whether the None end-of-stream marker was reached.
+    """
+    items = []
+    item = await queue.get()
+    while item is not None:
+        items.append(item)
+        if len(items) >= limit or queue.empty():
+            return items, False
+        item = queue.get_nowait()
+    return items, True
+
+def start_soffice_server() -> None:
+    """Start a headless LibreOffice that accepts UNO connections on SOFFICE_PORT."""
+    global _soffice_server
+    if uno is None or _soffice_server is not None:
+        return
+    _soffice_server = subprocess.Popen([
+        "soffice",
+        f"-env:UserInstallation=file:///tmp/lo_profile_{os.getpid()}",
+        "--headless",
+        "--invisible",
+        "--nologo",
+        "--norestore",
+        f"--accept=socket,host=localhost,port={SOFFICE_PORT};urp;StarOffice.ComponentContext"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def stop_soffice_server() -> None:
+    """Shut down the LibreOffice started by start_soffice_server."""
+    global _soffice_server
+    if _soffice_server is not None:
+        _soffice_server.terminate()
+        _soffice_server.wait()
+        _soffice_server = None
+
+def _uno_property(name: str, value) -> "PropertyValue":
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+def _convert_via_uno(pptx_path: Path, pdf_path: Path) -> None:
+    """Export pptx_path to pdf_path through the running LibreOffice instance."""
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    ctx = resolver.resolve(f"uno:socket,host=localhost,port={SOFFICE_PORT};urp;StarOffice.ComponentContext")
+    desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+    
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(str(pptx_path.resolve())), "_blank", 0, (_uno_property("Hidden", True),)
+    )
+    try:
+        doc.storeToURL(
+            uno.systemPathToFileUrl(str(pdf_path.resolve())), (_uno_property("FilterName", "impress_pdf_Export"),)
+        )
+    finally:
+        doc.close(True)
 
 def pptx_to_pdf(pptx_path: Path, out_dir: Path) -> Path:
-    """Convert PPTX to PDF using LibreOffice headless."""
+    """Convert PPTX to PDF using LibreOffice headless.
+    
+    This is the only LibreOffice pass per deck: the PDF feeds both text-layer
+    extraction and page rendering. Exporting slides to PNG directly is not an
+    option, since Impress's PNG filter writes only the first slide.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
     pdf_path = out_dir / f"{pptx_path.stem}.pdf"
     
-    subprocess.run([
-        "soffice",
-        "--headless",
-        "--convert-to", "pdf",
-        "--outdir", str(out_dir),
-        str(pptx_path)
-    ], check=True)
+    # Prefer the warm server; fall back to a one-shot process if it isn't reachable yet
+    if _soffice_server is not None and _soffice_server.poll() is None:
+        try:
+            _convert_via_uno(pptx_path, pdf_path)
+            return pdf_path
+        except Exception:
+            logger.warning("UNO conversion of %s failed, falling back to soffice", pptx_path.name, exc_info=True)
     
+    with _SOFFICE_FALLBACK_LOCK:
+        subprocess.run([
+            "soffice",
+            f"-env:UserInstallation={SOFFICE_WARM_PROFILE}",
+            "--headless",
+            "--convert-to", "pdf",
+            "--outdir", str(out_dir),
+            str(pptx_path)
+        ], check=True)
+    
+    if not pdf_path.exists():
+        raise RuntimeError(f"LibreOffice did not produce {pdf_path.name} from {pptx_path.name}")
     return pdf_path
 
-def pdf_to_images(pdf_path: Path, out_dir: Path) -> list[Path]:
-    """Convert PDF to images."""
-    images = convert_from_path(pdf_path)
-    image_paths = []
-    
-    for i, image in enumerate(images):
-        image_path = out_dir / f"slide_{i+1}.png"
-        image.save(image_path, "PNG")
-        image_paths.append(image_path)
+def extract_text_from_pdf(pdf_path: Path) -> list[str]:
+    """Read the embedded text layer of every PDF page."""
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            texts = []
+            for i in range(len(pdf)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            pdf.close()
+
+def render_thumbnails(pdf_path: Path, on_thumbnail: Callable[[int, Optional[str]], None], stop: threading.Event = None) -> None:
+    """Render every PDF page as a WebP data URL no larger than THUMBNAIL_SIZE.
     
-    return image_paths
+    on_thumbnail(i, url) is called as each page finishes, with None for a page
+    that fails to render. Rendering ends early once stop is set. The pdfium lock
+    is taken per page, so other requests' PDF work interleaves with long decks.
+    """
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        page_count = len(pdf)
+    try:
+        for i in range(page_count):
+            if stop is not None and stop.is_set():
+                return
+            try:
+                with _PDFIUM_LOCK:
+                    page = pdf[i]
+                    try:
+                        width, height = page.get_size()
+                        scale = min(THUMBNAIL_SIZE[0] / width, THUMBNAIL_SIZE[1] / height)
+                        bitmap = page.render(scale=scale)
+                        buf = io.BytesIO()
+                        bitmap.to_pil().save(buf, "WEBP", quality=THUMBNAIL_QUALITY)
+                        bitmap.close()
+                    finally:
+                        page.close()
+                thumbnail = "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode()
+            except Exception:
+                thumbnail = None
+            on_thumbnail(i, thumbnail)
+    finally:
+        with _PDFIUM_LOCK:
+            pdf.close()
+
+def pdf_to_images(pdf_path: Path, out_dir: Path, first_page: int = 1, last_page: int = None) -> list[Path]:
+    """Render PDF pages straight to PNG files, one Poppler thread per core."""
+    # 150 dpi is plenty for OCR of slide text; the prefix keeps page ranges apart
+    image_paths = convert_from_path(
+        str(pdf_path),
+        dpi=150,
+        first_page=first_page,
+        last_page=last_page,
+        thread_count=os.cpu_count() or 1,
+        output_folder=str(out_dir),
+        output_file=f"slide-{first_page:04d}-",
+        fmt="png",
+        paths_only=True
+    )
+    return [Path(p) for p in image_paths]
+
+def prepare_for_ocr(image_path: Path) -> Image.Image:
+    """Grayscale, downscale and binarize a slide image; Tesseract time scales with pixels and noise."""
+    img = Image.open(image_path).convert("L")
+    img.thumbnail((OCR_MAX_EDGE, OCR_MAX_EDGE), Image.LANCZOS)
+    return img.point(lambda x: 0 if x < OCR_THRESHOLD else 255, mode="1")
 
 def extract_text(image_path: Path) -> str:
     """Extract text from image using Tesseract OCR."""
-    return pytesseract.image_to_string(Image.open(image_path))
+    return pytesseract.image_to_string(prepare_for_ocr(image_path), config=TESSERACT_CONFIG)
 
-def summarize_openai(raw_text: str, api_key: str, style: str) -> str:
-    """Generate summary using OpenAI."""
-    openai.api_key = api_key
+def extract_text_batch(image_paths: list[Path]) -> list[str]:
+    """Extract text from several images with a single Tesseract invocation."""
+    if len(image_paths) == 1:
+        return [extract_text(image_paths[0])]
     
-    prompt = f"""
-    Please summarize the following text in a {style} style:
+    # Tesseract reads a newline-separated list of images from a .txt file and
+    # emits one form-feed separated page of text per image
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = []
+        for i, image_path in enumerate(image_paths):
+            prepared.append(Path(tmp) / f"{i:04d}.png")
+            prepare_for_ocr(image_path).save(prepared[-1])
+        list_file = Path(tmp) / "pages.txt"
+        list_file.write_text("\n".join(str(p) for p in prepared))
+        pages = pytesseract.image_to_string(str(list_file), config=TESSERACT_CONFIG).split("\f")
     
-    {raw_text}
-    """
+    if len(pages) == len(image_paths) + 1 and not pages[-1].strip():
+        pages = pages[:-1]
+    if len(pages) != len(image_paths):
+        return [extract_text(p) for p in image_paths]
+    return pages
+
+def ocr_cache_key(image_path: Path) -> str:
+    """Cache key for the OCR text of an image under the current OCR settings."""
+    settings = f"{TESSERACT_CONFIG}|{OCR_MAX_EDGE}|{OCR_THRESHOLD}"
+    return f"ocr-{cache.compute_text_hash(settings, cache.compute_file_hash(image_path))}"
+
+def ocr_pool() -> ProcessPoolExecutor:
+    """The shared OCR process pool, started on first use."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=_init_ocr_worker)
+    return _ocr_pool
+
+def stop_ocr_pool() -> None:
+    """Shut down the OCR pool, dropping queued work, without waiting for running shards."""
+    global _ocr_pool
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_pool = None
+
+def _init_ocr_worker():
+    """Keep each OCR worker single-threaded so N workers don't oversubscribe N cores."""
+    os.environ["OMP_NUM_THREADS"] = "1"
+
+async def ocr_batch(image_paths: list[Path], pool: ProcessPoolExecutor, use_cache: bool = True) -> list[str]:
+    """OCR a group of pages with one Tesseract run in the pool, skipping cached pages."""
+    texts = [None] * len(image_paths)
+    if use_cache:
+        keys = await asyncio.to_thread(lambda: [ocr_cache_key(p) for p in image_paths])
+        texts = [cache.load(key) for key in keys]
+    
+    pending = [i for i, text in enumerate(texts) if text is None]
+    if pending:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(pool, extract_text_batch, [image_paths[i] for i in pending])
+        for i, text in zip(pending, results):
+            texts[i] = text
+            if use_cache:
+                cache.store(keys[i], text)
     
+    return texts
+
+def clean_ocr(text: str) -> str:
+    """Drop noise lines (page numbers, OCR debris), collapse whitespace and cap the token count."""
+    lines = [line for line in text.splitlines() if sum(c.isalpha() for c in line) >= 2]
+    text = re.sub(r"\s+", " ", " ".join(lines)).strip()
+    encoding = load_token_encoding()
+    if encoding is None:
+        return text[:MAX_SLIDE_CHARS]
+    tokens = encoding.encode(text)
+    if len(tokens) > MAX_SLIDE_TOKENS:
+        text = encoding.decode(tokens[:MAX_SLIDE_TOKENS])
+    return text
+
+@functools.lru_cache(maxsize=None)
+def load_token_encoding() -> Optional["tiktoken.Encoding"]:
+    """The gpt-4o-mini tokenizer, loaded once; None if it can't be fetched.
+    
+    The first call may download the encoding, so make it from a thread.
+    """
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes text."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        return response.choices[0].message.content
-    except RateLimitError:
-        time.sleep(1)  # Wait before retrying
-        return summarize_openai(raw_text, api_key, style)
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return None
 
-def summarize_gemini(raw_text: str, api_key: str, style: str) -> str:
-    """Generate summary using Google Gemini."""
-    genai.configure(api_key=api_key)
+def summary_cache_key(text: str, provider: str, model: str, style: str) -> str:
+    """Cache key for a slide summary."""
+    return f"summary-{cache.compute_text_hash(provider, model, style, text)}"
+
+def build_batch_prompt(texts: list[str], style: str) -> str:
+    """Pack several slides into one prompt with numbered delimiters."""
+    slides = "\n".join(f"### Slide {i}\n{text}" for i, text in enumerate(texts, 1))
+    return (
+        f"Please summarize each of the following {len(texts)} slides in a {style} style.\n"
+        f"Reply with exactly {len(texts)} sections in the same order, each starting with "
+        f"a header line of the form \"### Summary <n>\" and nothing else on that line.\n\n"
+        f"{slides}"
+    )
+
+def parse_batch_response(content: str, count: int) -> Optional[list[str]]:
+    """Split a batched reply into per-slide summaries, or None if it doesn't line up."""
+    parts = SUMMARY_HEADER.split(content)
+    summaries = {int(num): body.strip() for num, body in zip(parts[1::2], parts[2::2])}
+    if sorted(summaries) != list(range(1, count + 1)):
+        return None
+    return [summaries[i] for i in range(1, count + 1)]
+
+async def summarize_batch(texts: list[str], provider: str, api_key: str, style: str) -> list:
+    """Summarize a group of slides with one request, falling back to one request per slide.
     
-    prompt = f"""
+    The fallback covers replies that don't line up with the slides and batched
+    requests the provider rejects (e.g. a combined prompt that is too long).
+    Rate limits and timeouts that outlast the retries are raised instead, since
+    more requests would only make them worse.
+    """
+    summarize = summarize_openai if provider == "openai" else summarize_gemini
+    if len(texts) > 1:
+        complete = complete_openai if provider == "openai" else complete_gemini
+        try:
+            content = await complete(
+                build_batch_prompt(texts, style), api_key, max_tokens=BATCH_MAX_TOKENS_PER_SLIDE * len(texts)
+            )
+        except (openai.RateLimitError, ResourceExhausted, asyncio.TimeoutError):
+            raise
+        except Exception:
+            content = None
+        summaries = parse_batch_response(content, len(texts)) if content is not None else None
+        if summaries is not None:
+            return summaries
+    return await asyncio.gather(*(summarize(text, api_key, style) for text in texts), return_exceptions=True)
+
+def build_prompt(raw_text: str, style: str) -> str:
+    """Prompt asking for a summary of a single slide."""
+    return f"""
     Please summarize the following text in a {style} style:
     
     {raw_text}
     """
+
+async def summarize_openai(raw_text: str, api_key: str, style: str) -> str:
+    """Generate summary using OpenAI."""
+    return await complete_openai(build_prompt(raw_text, style), api_key)
+
+async def summarize_gemini(raw_text: str, api_key: str, style: str) -> str:
+    """Generate summary using Google Gemini."""
+    return await complete_gemini(build_prompt(raw_text, style), api_key)
+
+async def summarize_openai_batch(texts: list[str], api_key: str, style: str) -> list:
+    """Summarize slides through the OpenAI Batch API: one upload, one job, half the token price.
+    
+    Blocks until the job finishes, which can take anywhere from minutes up to the
+    24h completion window, so it is meant for non-interactive use.
+    """
+    client = openai_client(api_key)
+    
+    lines = [
+        json.dumps({
+            "custom_id": f"slide-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": openai_request_body(build_prompt(text, style), SUMMARY_MAX_TOKENS)
+        })
+        for i, text in enumerate(texts)
+    ]
+    input_file = await client.files.create(file=("summaries.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    
+    # Poll with exponential backoff until the job reaches a terminal state
+    delay = BATCH_POLL_INITIAL
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+    
+    summaries = [RuntimeError("missing from batch output")] * len(texts)
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        i = int(record["custom_id"].removeprefix("slide-"))
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            summaries[i] = response["body"]["choices"][0]["message"]["content"]
+        else:
+            summaries[i] = RuntimeError(record.get("error") or response.get("body"))
+    return summaries
+
+def openai_request_body(prompt: str, max_tokens: int) -> dict:
+    """Chat completion request parameters shared by live and batch calls."""
+    return {
+        "model": MODEL_OPENAI,
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant that summarizes text."},
+            {"role": "user", "content": prompt}
+        ],
+        "n": 1,
+        "max_tokens": max_tokens,
+        "temperature": LLM_TEMPERATURE
+    }
+
+# Clients are built once per API key and reused by every slide and request,
+# keeping their connection pools warm
+@functools.lru_cache(maxsize=32)
+def openai_client(api_key: str) -> openai.AsyncOpenAI:
+    """Shared AsyncOpenAI client for api_key."""
+    return openai.AsyncOpenAI(api_key=api_key, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+
+@functools.lru_cache(maxsize=32)
+def gemini_client(api_key: str) -> glm.GenerativeServiceAsyncClient:
+    """Shared Gemini client bound to api_key.
+    
+    Requests go straight to the generativelanguage client rather than through
+    genai.GenerativeModel, whose client follows the process-wide genai.configure(),
+    so another request could swap its key in before this one's call.
+    """
+    return glm.GenerativeServiceAsyncClient(client_options={"api_key": api_key})
+
+@retry_on_rate_limit
+async def complete_openai(prompt: str, api_key: str, max_tokens: int = SUMMARY_MAX_TOKENS) -> str:
+    """Send a single prompt to OpenAI, throttled per provider limits."""
+    client = openai_client(api_key)
+    
+    async with SEMAPHORES["openai"], LIMITERS["openai"]:
+        response = await client.chat.completions.create(**openai_request_body(prompt, max_tokens))
+    return response.choices[0].message.content
+
+@retry_on_rate_limit
+async def complete_gemini(prompt: str, api_key: str, max_tokens: int = SUMMARY_MAX_TOKENS) -> str:
+    """Send a single prompt to Gemini, throttled per provider limits."""
+    client = gemini_client(api_key)
+    request = glm.GenerateContentRequest(
+        model=MODEL_GEMINI if "/" in MODEL_GEMINI else f"models/{MODEL_GEMINI}",
+        contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+        generation_config=glm.GenerationConfig(temperature=LLM_TEMPERATURE, max_output_tokens=max_tokens)
+    )
     
-    model = genai.GenerativeModel('gemini-pro')
-    response = model.generate_content(prompt)
-    return response.text 
\ No newline at end of file
+    async with SEMAPHORES["gemini"], LIMITERS["gemini"]:
+        response = await asyncio.wait_for(client.generate_content(request), timeout=LLM_TIMEOUT)
+    if not response.candidates:
+        raise ValueError(f"Gemini returned no candidates: {response.prompt_feedback}")
+    return "".join(part.text for part in response.candidates[0].content.parts)
@@ -2,10 +2,11 @@ from fastapi import FastAPI, Request, Form, File, UploadFile
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import requests
+import aiofiles
+import httpx
+import json
 import os
 from pathlib import Path
-import shutil
 from typing import Optional
 
 app = FastAPI(title="Slide Summarizer")
@@ -20,6 +21,16 @@ templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 # Get backend URL from environment variable
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# One pooled client for all backend calls; summarizing a deck can take minutes
+HTTP = httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=10.0))
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await HTTP.aclose()
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -34,24 +45,40 @@ async def summarize(
     gemini_key: str = Form(None)
 ):
     try:
-        # Prepare the file for upload
-        files = {"file": (file.filename, await file.read())}
+        # Pass the spooled upload through as a stream rather than reading it into memory
+        files = {"file": (file.filename, file.file, file.content_type)}
         data = {
             "provider": provider,
             "style": style,
             "openai_key": openai_key,
             "gemini_key": gemini_key
         }
+        data = {key: value for key, value in data.items() if value is not None}
 
-        # Make API request to backend
-        response = requests.post(
+        # Make API request to backend without blocking the event loop; the
+        # backend streams one NDJSON line per slide, in completion order
+        results = []
+        error = None
+        async with HTTP.stream(
+            "POST",
             f"{BACKEND_URL}/summarize",
             files=files,
             data=data
-        )
+        ) as response:
+            if response.status_code == 200:
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    slide = json.loads(line)
+                    if "error" in slide:
+                        error = slide["error"]
+                    else:
+                        results.append(slide)
+            else:
+                error = (await response.aread()).decode()
         
-        if response.status_code == 200:
-            results = response.json()
+        if error is None:
+            results.sort(key=lambda slide: slide["slide_number"])
             return templates.TemplateResponse(
                 "results.html",
                 {
@@ -64,7 +91,7 @@ async def summarize(
                 "error.html",
                 {
                     "request": request,
-                    "error": response.text
+                    "error": error
                 }
             )
             
@@ -87,10 +114,11 @@ async def upload_file(
     upload_dir = Path("uploads")
     upload_dir.mkdir(exist_ok=True)
     
-    # Save the uploaded file
+    # Stream the uploaded file to disk
     file_path = upload_dir / file.filename
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
     
     # Process the file (placeholder for actual processing)
     # TODO: Implement file processing logic
@@ -49,11 +49,27 @@ st.markdown("""
 # Constants
 BACKEND_URL = st.secrets.get("BACKEND_URL", "http://localhost:8000")  # Will be set in Vercel environment
 
+def render_slide(slide):
+    """Display one slide's thumbnail and summary."""
+    st.markdown(f"### Slide {slide['slide_number']}")
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        # Display slide thumbnail; decoding the backend's data URL
+        # lets Streamlit serve it from its media endpoint
+        # instead of inlining the base64 in the page
+        if slide.get('thumbnail'):
+            st.image(base64.b64decode(slide['thumbnail'].split(",", 1)[1]))
+
+    with col2:
+        # Display summary
+        st.markdown(slide['summary'])
+
 def main():
     st.title("📑 Slide Summarizer")
     st.markdown("""
     Upload your PowerPoint presentation and get AI-powered summaries for each slide.
-    Choose between OpenAI's GPT-3.5-Turbo or Google's Gemini for summarization.
+    Choose between OpenAI's GPT-4o mini or Google's Gemini for summarization.
     """)
 
     # Sidebar configuration
@@ -106,31 +122,41 @@ def main():
                         "gemini_key": gemini_key
                     }
 
-                    # Make API request to backend
+                    # Make API request to backend; slides stream back one NDJSON
+                    # line each, in the order they finish
                     response = requests.post(
                         f"{BACKEND_URL}/summarize",
                         files=files,
-                        data=data
+                        data=data,
+                        stream=True
                     )
                     
                     if response.status_code == 200:
-                        results = response.json()
+                        results = []
+                        slides_area = st.empty()
+                        live_area = slides_area.container()
+                        
+                        # Display each slide as soon as it arrives
+                        for line in response.iter_lines():
+                            if not line:
+                                continue
+                            slide = json.loads(line)
+                            if "error" in slide:
+                                st.error(f"Error: {slide['error']}")
+                                break
+                            results.append(slide)
+                            with live_area:
+                                render_slide(slide)
+                        
+                        # Slides arrive in completion order; once they're all in,
+                        # redraw them in slide order
+                        ordered = sorted(results, key=lambda slide: slide["slide_number"])
+                        if ordered != results:
+                            with slides_area.container():
+                                for slide in ordered:
+                                    render_slide(slide)
+                        results = ordered
                         
-                        # Display results
-                        for slide in results:
-                            with st.container():
-                                st.markdown(f"### Slide {slide['slide_number']}")
-                                col1, col2 = st.columns([1, 2])
-                                
-                                with col1:
-                                    # Display slide thumbnail
-                                    if slide.get('thumbnail'):
-                                        st.image(slide['thumbnail'])
-                                
-                                with col2:
-                                    # Display summary
-                                    st.markdown(slide['summary'])
-                                    
                         # Download button
                         st.download_button(
                             label="📥 Download All Summaries",
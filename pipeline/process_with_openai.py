@@ -9,10 +9,10 @@ Prerequisites:
   - Python packages: Pillow, pdf2image, pytesseract, openai, python-dotenv
 """
 
+import asyncio
 import os
 import subprocess
 import sys
-import time
 from pathlib import Path
 from pdf2image import convert_from_path
 from dotenv import load_dotenv
@@ -23,9 +23,10 @@ import pytesseract
 # Load OpenAI API key
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
+MODEL_OPENAI = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-# Throttle settings to respect token limits
-MIN_INTERVAL = 2  # seconds between API calls
+# Summarization requests in flight at once
+MAX_CONCURRENT_REQUESTS = 8
 
 
 def pptx_to_pdf(pptx_path: Path, out_dir: Path) -> Path:
@@ -43,12 +44,17 @@ def pptx_to_pdf(pptx_path: Path, out_dir: Path) -> Path:
 
 
 def pdf_to_images(pdf_path: Path, out_dir: Path) -> list[Path]:
-    """Convert each PDF page to a PNG image."""
+    """Convert each PDF page to a PNG image, named slide_0001.png, ... in page order."""
     out_dir.mkdir(parents=True, exist_ok=True)
-    images = convert_from_path(
-        str(pdf_path), dpi=200, output_folder=str(out_dir), fmt="png"
+    image_paths = convert_from_path(
+        str(pdf_path), dpi=200, output_folder=str(out_dir), fmt="png", paths_only=True
     )
-    return [Path(img.filename) for img in images]
+    slides = []
+    for i, image_path in enumerate(image_paths, start=1):
+        slide_path = out_dir / f"slide_{i:04d}.png"
+        Path(image_path).replace(slide_path)
+        slides.append(slide_path)
+    return slides
 
 
 def extract_text(image_path: Path) -> str:
@@ -58,8 +64,8 @@ def extract_text(image_path: Path) -> str:
     return text.strip()
 
 
-def summarize_text(raw_text: str) -> str:
-    """Send extracted text to OpenAI for a concise summary."""
+async def summarize_text(raw_text: str, client: openai.AsyncOpenAI, sem: asyncio.Semaphore) -> str:
+    """Send extracted text to OpenAI for a concise summary, one of at most sem's requests at a time."""
     if not raw_text:
         return "[No extractable text found on this slide.]"
 
@@ -67,14 +73,15 @@ def summarize_text(raw_text: str) -> str:
         "Below is the raw text extracted from a presentation slide. "
         "Please provide a concise summary in 2-3 sentences, focusing on key points:\n\n" + raw_text
     )
-    resp = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}]
-    )
+    async with sem:
+        resp = await client.chat.completions.create(
+            model=MODEL_OPENAI,
+            messages=[{"role": "user", "content": prompt}]
+        )
     return resp.choices[0].message.content.strip()
 
 
-def process_deck(pptx_file: str, work_dir: str):
+async def process_deck(pptx_file: str, work_dir: str):
     """Full pipeline: PPTX → PDF → images → OCR → summarization."""
     base = Path(work_dir)
 
@@ -86,16 +93,21 @@ def process_deck(pptx_file: str, work_dir: str):
     img_dir = base / "images"
     images = pdf_to_images(pdf, img_dir)
 
-    # 3. OCR and summarize
-    for idx, img_path in enumerate(sorted(images), start=1):
-        raw_text = extract_text(img_path)
-        summary = summarize_text(raw_text)
+    # 3. OCR, then summarize the slides concurrently over one shared client
+    texts = [extract_text(img_path) for img_path in images]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with openai.AsyncOpenAI(api_key=openai.api_key) as client:
+        summaries = await asyncio.gather(
+            *(summarize_text(raw_text, client, sem) for raw_text in texts), return_exceptions=True
+        )
+    for idx, summary in enumerate(summaries, start=1):
+        if isinstance(summary, Exception):
+            summary = f"[Error summarizing slide: {summary}]"
         print(f"--- Slide {idx} ---\n{summary}\n")
-        time.sleep(MIN_INTERVAL)
 
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
         print("Usage: python process_with_openai.py <deck.pptx> <work_dir>")
         sys.exit(1)
-    process_deck(sys.argv[1], sys.argv[2])
+    asyncio.run(process_deck(sys.argv[1], sys.argv[2]))
@@ -8,22 +8,31 @@ Supports two providers:
   - gemini      (requires GEMINI_API_KEY, defaults to Gemini 2.5 Flash Preview)
 
 Usage:
-    python run_pipeline.py <deck.pptx> <work_dir> [provider]
+    python run_pipeline.py <deck.pptx> <work_dir> [provider] [--batch]
 
 Examples:
     python run_pipeline.py slides.pptx output openai
     python run_pipeline.py slides.pptx output gemini
+    python run_pipeline.py slides.pptx output openai --batch
+
+--batch submits the whole deck as one OpenAI Batch API job (half price,
+results once the job completes) instead of one live request per slide.
 
 Environment variables:
-    OPENAI_API_KEY     -- API key for OpenAI (GPT-3.5-turbo)
+    OPENAI_API_KEY     -- API key for OpenAI
+    OPENAI_MODEL       -- OpenAI model (default: gpt-4o-mini)
     GEMINI_API_KEY     -- API key for Google Gemini
     GEMINI_MODEL       -- Gemini model (default: models/gemini-2.5-flash-preview-04-17)
 """
 import os
+import re
 import sys
-import time
+import json
+import shutil
+import asyncio
 import subprocess
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Union
 from dotenv import load_dotenv
 
 from pdf2image import convert_from_path
@@ -31,8 +40,27 @@ from PIL import Image
 import pytesseract
 
 import openai
-import google.generativeai as genai
-from openai.error import RateLimitError
+import google.ai.generativelanguage as glm
+from google.api_core.exceptions import ResourceExhausted
+from openai import RateLimitError
+
+MODEL_OPENAI = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# What every summary prompt asks for unless a caller passes its own instruction
+SUMMARY_INSTRUCTION = "Provide a concise 2-3 sentence summary focusing on key points"
+
+# Slides packed into one summarization request; slides with more text than
+# BATCH_MAX_CHARS (roughly 1000 tokens) are sent one per request instead
+SLIDE_BATCH_SIZE = 5
+BATCH_MAX_CHARS = 4000
+
+# Summarization requests the CLI keeps in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+
+# Long-lived LibreOffice (unoserver) that unoconvert hands conversions to,
+# skipping the multi-second soffice start-up on every deck
+UNOSERVER_PORT = int(os.getenv("UNOSERVER_PORT", 2003))
+_unoserver = None
 
 # Load environment variables
 def load_keys():
@@ -44,74 +72,404 @@ def load_keys():
 
 # Conversion functions
 
+def start_unoserver() -> Optional[subprocess.Popen]:
+    """Start unoserver on UNOSERVER_PORT if it is installed; returns the process or None."""
+    global _unoserver
+    if _unoserver is None and shutil.which("unoserver"):
+        _unoserver = subprocess.Popen(
+            ["unoserver", "--port", str(UNOSERVER_PORT)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    return _unoserver
+
+def stop_unoserver() -> None:
+    """Shut down the server started by start_unoserver."""
+    global _unoserver
+    if _unoserver is not None:
+        _unoserver.terminate()
+        _unoserver.wait()
+        _unoserver = None
+
 def pptx_to_pdf(pptx_path: Path, out_dir: Path) -> Path:
-    """Convert PPTX to PDF using LibreOffice headless."""
+    """Convert PPTX to PDF using LibreOffice headless.
+
+    Goes through the running unoserver when there is one, otherwise starts soffice.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
+    pdf_path = out_dir / pptx_path.with_suffix('.pdf').name
+
+    # Fall back to a one-shot soffice if the server is down or not accepting yet
+    if _unoserver is not None and _unoserver.poll() is None:
+        try:
+            subprocess.run([
+                "unoconvert", "--port", str(UNOSERVER_PORT), str(pptx_path), str(pdf_path)
+            ], check=True, capture_output=True)
+            return pdf_path
+        except (OSError, subprocess.CalledProcessError):
+            pass
+
     subprocess.run([
         "soffice","--headless","--convert-to","pdf",
         "--outdir", str(out_dir), str(pptx_path)
     ], check=True)
-    return out_dir / pptx_path.with_suffix('.pdf').name
+    if not pdf_path.exists():
+        raise RuntimeError(f"LibreOffice did not produce {pdf_path.name} from {pptx_path.name}")
+    return pdf_path
 
 
 def pdf_to_images(pdf_path: Path, out_dir: Path) -> list[Path]:
-    """Rasterize each PDF page to a PNG image."""
+    """Rasterize each PDF page to a PNG image.
+
+    Returns the paths in page order, named slide_0001.png, slide_0002.png, ...
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
-    pil_images = convert_from_path(
-        str(pdf_path), dpi=200, output_folder=str(out_dir), fmt="png"
+    image_paths = convert_from_path(
+        str(pdf_path), dpi=200, output_folder=str(out_dir), fmt="png", paths_only=True
+    )
+    slides = []
+    for i, image_path in enumerate(image_paths, start=1):
+        slide_path = out_dir / f"slide_{i:04d}.png"
+        Path(image_path).replace(slide_path)
+        slides.append(slide_path)
+    return slides
+
+# Text extraction
+def extract_text_bulk(pdf_path: Path) -> list[str]:
+    """Read the text layer of every PDF page in one pdftotext pass.
+
+    Pages without a text layer (scanned or image-only slides) come back empty.
+    """
+    result = subprocess.run(
+        ["pdftotext", "-layout", str(pdf_path), "-"], capture_output=True, check=True
     )
-    return [Path(img.filename) for img in pil_images]
+    # pdftotext ends every page with a form feed
+    pages = result.stdout.decode("utf-8", errors="replace").split("\f")[:-1]
+    return [page.strip() for page in pages]
 
-# OCR extraction
 def extract_text(image_path: Path) -> str:
     """Use Tesseract OCR to extract text from a slide image."""
     img = Image.open(image_path)
     return pytesseract.image_to_string(img).strip()
 
 # Summarization providers
-def summarize_openai(raw_text: str) -> str:
-    """Summarize extracted text via OpenAI GPT-3.5-Turbo."""
-    if not raw_text:
-        return "[No text detected]"
-    prompt = (
-        "Below is OCR-extracted text from a slide. "
-        "Provide a concise 2-3 sentence summary focusing on key points:\n\n" + raw_text
+def build_prompt(raw_text: str, instruction: str = SUMMARY_INSTRUCTION) -> str:
+    """Prompt asking for a summary of a single slide."""
+    return f"Below is OCR-extracted text from a slide. {instruction}:\n\n" + raw_text
+
+
+class GeminiClient(NamedTuple):
+    """A generativelanguage client bound to one API key, and the model it calls.
+
+    Built directly rather than through genai.GenerativeModel, whose client
+    follows the process-wide genai.configure() key.
+    """
+    service: Union[glm.GenerativeServiceClient, glm.GenerativeServiceAsyncClient]
+    model: str
+
+    @classmethod
+    def create(cls, api_key: str, model: str, asynchronous: bool = False) -> "GeminiClient":
+        service_cls = glm.GenerativeServiceAsyncClient if asynchronous else glm.GenerativeServiceClient
+        return cls(service_cls(client_options={"api_key": api_key}), model if "/" in model else f"models/{model}")
+
+
+def gemini_request(prompt: str, model: str, json_mode: bool = False) -> glm.GenerateContentRequest:
+    """Single-turn generate_content request; JSON mode needs google-ai-generativelanguage >= 0.6.2."""
+    return glm.GenerateContentRequest(
+        model=model,
+        contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+        generation_config=glm.GenerationConfig(response_mime_type="application/json") if json_mode else None
     )
-    resp = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role":"user","content":prompt}]
+
+
+def gemini_text(response: glm.GenerateContentResponse) -> str:
+    """Text of the first candidate, or ValueError if the prompt was blocked."""
+    if not response.candidates:
+        raise ValueError(f"Gemini returned no candidates: {response.prompt_feedback}")
+    return "".join(part.text for part in response.candidates[0].content.parts)
+
+
+def complete(prompt: str, provider: str, client, json_mode: bool = False) -> str:
+    """Send one prompt with an existing client and return the raw reply text.
+
+    client is an openai.OpenAI for openai and a GeminiClient for gemini.
+    With json_mode the provider's JSON output mode is requested.
+    """
+    if provider.lower() == 'gemini':
+        return gemini_text(client.service.generate_content(gemini_request(prompt, client.model, json_mode)))
+    resp = client.chat.completions.create(
+        model=MODEL_OPENAI,
+        messages=[{"role":"user","content":prompt}],
+        **({"response_format": {"type": "json_object"}} if json_mode else {})
     )
-    return resp.choices[0].message.content.strip()
+    return resp.choices[0].message.content
 
 
-def summarize_gemini(raw_text: str, api_key: str, model: str) -> str:
-    """Summarize extracted text via Google Gemini API."""
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not set")
-    
-    # Configure the Gemini API with the provided key
-    genai.configure(api_key=api_key)
-    
+async def acomplete(prompt: str, provider: str, client, json_mode: bool = False) -> str:
+    """Async variant of complete; client is an openai.AsyncOpenAI or an asynchronous GeminiClient."""
+    if provider.lower() == 'gemini':
+        return gemini_text(await client.service.generate_content(gemini_request(prompt, client.model, json_mode)))
+    resp = await client.chat.completions.create(
+        model=MODEL_OPENAI,
+        messages=[{"role":"user","content":prompt}],
+        **({"response_format": {"type": "json_object"}} if json_mode else {})
+    )
+    return resp.choices[0].message.content
+
+
+def summarize_openai(raw_text: str, client: openai.OpenAI = None) -> str:
+    """Summarize extracted text via OpenAI (MODEL_OPENAI, gpt-4o-mini by default).
+
+    Uses the module-level client (openai.api_key) unless a client is given.
+    """
     if not raw_text:
         return "[No text detected]"
+    return complete(build_prompt(raw_text), 'openai', client or openai).strip()
+
+
+def summarize_gemini(raw_text: str, api_key: str, model: str, client: GeminiClient = None) -> str:
+    """Summarize extracted text via Google Gemini API.
+
+    Pass client to reuse an existing GeminiClient instead of creating one for api_key.
+    """
+    if client is None:
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not set")
+        client = GeminiClient.create(api_key, model)
     
-    # Create the model
-    model_instance = genai.GenerativeModel(model)
-    
-    prompt = (
-        "Below is OCR-extracted text from a slide. "
-        "Provide a concise 2-3 sentence summary focusing on key points:\n\n" + raw_text
+    if not raw_text:
+        return "[No text detected]"
+    return complete(build_prompt(raw_text), 'gemini', client).strip()
+
+
+def build_batch_prompt(texts: list[str], instruction: str = SUMMARY_INSTRUCTION) -> str:
+    """Prompt asking for a JSON object with one summary per numbered slide."""
+    slides = "\n".join(f"[{i}]: {text}" for i, text in enumerate(texts))
+    return (
+        "Below is OCR-extracted text from several slides. "
+        f"Summarize each slide separately. {instruction}. "
+        'Return JSON of the form {"summaries": [{"i": 0, "s": "..."}, ...]} '
+        "with exactly one entry per slide, numbered as below.\n\n" + slides
     )
-    
-    # Generate the response using the proper method
-    response = model_instance.generate_content(prompt)
-    
-    # Extract the text from the response
-    return response.text.strip()
+
+
+def parse_batch_response(content: str, count: int) -> Optional[list[str]]:
+    """Map a JSON batch reply back to per-slide summaries, or None if it doesn't line up."""
+    try:
+        summaries = {int(entry["i"]): str(entry["s"]).strip() for entry in json.loads(content)["summaries"]}
+    except (ValueError, KeyError, TypeError):
+        return None
+    if sorted(summaries) != list(range(count)):
+        return None
+    return [summaries[i] for i in range(count)]
+
+
+def iter_batch_summaries(deltas: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """Yield (i, summary) from a streamed JSON batch reply as each entry completes."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = None
+    for delta in deltas:
+        buf += delta
+        if pos is None:
+            start = re.search(r'"summaries"\s*:\s*\[', buf)
+            if not start:
+                continue
+            pos = start.end()
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf) or buf[pos] == "]":
+                break
+            try:
+                entry, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # entry not complete yet
+            try:
+                yield int(entry["i"]), str(entry["s"]).strip()
+            except (ValueError, KeyError, TypeError):
+                pass
+
+
+def stream_openai_json(prompt: str, client: openai.OpenAI) -> Iterator[str]:
+    """Stream the text of a JSON-mode OpenAI reply as it is generated."""
+    stream = client.chat.completions.create(
+        model=MODEL_OPENAI,
+        messages=[{"role":"user","content":prompt}],
+        response_format={"type": "json_object"},
+        stream=True
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _plan_batch(texts: list[str]) -> tuple[list[int], list[str], bool]:
+    """Split out the slides that need a request and say whether they can share one."""
+    pending = [i for i, text in enumerate(texts) if text]
+    batch = [texts[i] for i in pending]
+    return pending, batch, len(batch) > 1 and all(len(text) <= BATCH_MAX_CHARS for text in batch)
+
+
+def _merge_batch(texts: list[str], pending: list[int], parsed: list) -> list:
+    """Put the summaries of the requested slides back among the empty ones."""
+    summaries = ["[No text detected]"] * len(texts)
+    for i, summary in zip(pending, parsed):
+        summaries[i] = summary
+    return summaries
+
+
+def summarize_batch(texts: list[str], provider: str, client, on_summary: Callable[[int, str], None] = None, before_request: Callable[[], None] = None, instruction: str = SUMMARY_INSTRUCTION) -> list:
+    """Sync variant of asummarize_batch using an existing client (see complete).
+
+    instruction says what kind of summary to write (see build_prompt).
+
+    With on_summary, OpenAI replies are streamed and on_summary(i, summary) is
+    called for each slide as soon as its entry arrives, before the full result.
+    Slides already streamed when the stream breaks partway are kept, so the
+    fallback only requests the rest; a complete reply that doesn't line up with
+    the slides is discarded whole. before_request() is called before every API request (one
+    for the batch, one per remaining slide in the fallback), e.g. to wait on a
+    rate limiter.
+    """
+    before_request = before_request or (lambda: None)
+    pending, batch, shared = _plan_batch(texts)
+
+    parsed = None
+    streamed = {}
+    if shared:
+        prompt = build_batch_prompt(batch, instruction)
+        try:
+            before_request()
+            if on_summary is not None and provider.lower() != 'gemini':
+                deltas = []
+                def collect():
+                    for delta in stream_openai_json(prompt, client):
+                        deltas.append(delta)
+                        yield delta
+                for i, summary in iter_batch_summaries(collect()):
+                    if 0 <= i < len(batch) and i not in streamed:
+                        streamed[i] = summary
+                        on_summary(pending[i], summary)
+                content = "".join(deltas)
+            else:
+                content = complete(prompt, provider, client, json_mode=True)
+            parsed = parse_batch_response(content, len(batch))
+            if parsed is None:
+                # The reply doesn't line up with the slides, so its streamed entries can't be trusted
+                streamed.clear()
+        except (RateLimitError, ResourceExhausted):
+            raise
+        except Exception:
+            # JSON mode rejected (older SDK or model without it): go slide by slide
+            parsed = None
+    if parsed is None:
+        parsed = []
+        for i, text in enumerate(batch):
+            if i in streamed:
+                parsed.append(streamed[i])
+                continue
+            try:
+                before_request()
+                parsed.append(complete(build_prompt(text, instruction), provider, client).strip())
+            except Exception as e:
+                parsed.append(e)
+    return _merge_batch(texts, pending, parsed)
+
+
+async def asummarize_batch(texts: list[str], provider: str, client, sem: asyncio.Semaphore) -> list:
+    """Summarize several slides with one request, falling back to one request per slide.
+
+    client is as for acomplete; every request waits on sem, which bounds
+    how many are in flight across all concurrent batches.
+
+    The fallback is used when a slide is too long to share a request, the JSON-mode
+    request is rejected (Gemini needs google-ai-generativelanguage >= 0.6.2) or the reply
+    can't be mapped back to the slides; slides that fail there hold their exception.
+    Rate-limit errors are raised so the caller can back off and retry.
+    """
+    pending, batch, shared = _plan_batch(texts)
+
+    parsed = None
+    if shared:
+        try:
+            async with sem:
+                content = await acomplete(build_batch_prompt(batch), provider, client, json_mode=True)
+            parsed = parse_batch_response(content, len(batch))
+        except (RateLimitError, ResourceExhausted):
+            raise
+        except Exception:
+            # JSON mode rejected (older SDK or model without it): go slide by slide
+            parsed = None
+    if parsed is None:
+        async def summarize_one(text):
+            async with sem:
+                return (await acomplete(build_prompt(text), provider, client)).strip()
+        parsed = await asyncio.gather(*(summarize_one(text) for text in batch), return_exceptions=True)
+    return _merge_batch(texts, pending, parsed)
+
+
+async def asummarize_openai_batch(texts: list[str], client: openai.AsyncOpenAI) -> list[str]:
+    """Summarize all slides in one OpenAI Batch API job and wait for it to finish."""
+    lines = [
+        json.dumps({
+            "custom_id": f"slide-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": MODEL_OPENAI,
+                "messages": [{"role": "user", "content": build_prompt(text)}],
+            },
+        })
+        for i, text in enumerate(texts) if text
+    ]
+    summaries = ["[No text detected]" if not text else "[Error processing slide]" for text in texts]
+    if not lines:
+        return summaries
+
+    input_file = await client.files.create(file=("slides.jsonl", "\n".join(lines).encode()), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    # Poll with exponential backoff (5s doubling up to 60s)
+    delay = 5
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        print(f"Batch {batch.id}: {batch.status}, checking again in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            idx = int(record["custom_id"].removeprefix("slide-"))
+            summaries[idx] = response["body"]["choices"][0]["message"]["content"].strip()
+    return summaries
 
 # Main pipeline
 
-def process_deck(deck_path: str, work_dir: str, provider: str):
+async def _summarize_chunk(first_idx: int, texts: list[str], provider: str, client, sem: asyncio.Semaphore) -> list[str]:
+    """Summarize a run of slides in one request, retrying once on rate limiting."""
+    try:
+        try:
+            summaries = await asummarize_batch(texts, provider, client, sem)
+        except (RateLimitError, ResourceExhausted):
+            await asyncio.sleep(5)
+            summaries = await asummarize_batch(texts, provider, client, sem)
+    except Exception as e:
+        summaries = [e] * len(texts)
+    for idx, summary in enumerate(summaries, start=first_idx):
+        if isinstance(summary, Exception):
+            print(f"Error processing slide {idx}: {summary}")
+    return ["[Error processing slide]" if isinstance(s, Exception) else s for s in summaries]
+
+
+async def process_deck(deck_path: str, work_dir: str, provider: str, batch: bool = False):
     base = Path(work_dir)
     # 1) PPTX → PDF
     pdf_dir = base / 'pdf'
@@ -121,32 +479,53 @@ def process_deck(deck_path: str, work_dir: str, provider: str):
     img_dir = base / 'images'
     slides = pdf_to_images(pdf_file, img_dir)
 
-    # 3) OCR & summarization
+    # 3) Text layer, with OCR only for pages that have none
+    layer = extract_text_bulk(pdf_file)
+    texts = [
+        layer[i] if i < len(layer) and layer[i] else extract_text(slide_img)
+        for i, slide_img in enumerate(slides)
+    ]
+
+    # 4) Summarization (SLIDE_BATCH_SIZE slides per request, at most
+    #    MAX_CONCURRENT_REQUESTS requests at once, one client for the whole run)
     gemini_key, gemini_model = load_keys()
-    for idx, slide_img in enumerate(sorted(slides), start=1):
-        text = extract_text(slide_img)
-        try:
-            if provider.lower() == 'gemini':
-                summary = summarize_gemini(text, gemini_key, gemini_model)
-            else:
-                summary = summarize_openai(text)
-        except RateLimitError:
-            time.sleep(5)
-            summary = summarize_openai(text) if provider!='gemini' else summarize_gemini(text, gemini_key, gemini_model)
-        except Exception as e:
-            print(f"Error processing slide {idx}: {e}")
-            summary = "[Error processing slide]"
+    if provider.lower() == 'gemini':
+        if not gemini_key:
+            raise ValueError("GEMINI_API_KEY not set")
+        client = GeminiClient.create(gemini_key, gemini_model, asynchronous=True)
+    else:
+        client = openai.AsyncOpenAI(api_key=openai.api_key)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    try:
+        if batch:
+            summaries = await asummarize_openai_batch(texts, client)
+        else:
+            chunks = await asyncio.gather(*[
+                _summarize_chunk(start + 1, texts[start:start + SLIDE_BATCH_SIZE], provider, client, sem)
+                for start in range(0, len(texts), SLIDE_BATCH_SIZE)
+            ])
+            summaries = [summary for chunk in chunks for summary in chunk]
+    finally:
+        if isinstance(client, GeminiClient):
+            await client.service.transport.close()
+        else:
+            await client.close()
 
+    for idx, summary in enumerate(summaries, start=1):
         print(f"--- Slide {idx} ---\n{summary}\n")
-        time.sleep(1)
 
 # CLI entry-point
 
 if __name__ == '__main__':
-    if len(sys.argv) < 3 or len(sys.argv) > 4:
-        print("Usage: python run_pipeline.py <deck.pptx> <work_dir> [openai|gemini]")
+    use_batch = '--batch' in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != '--batch']
+    if len(args) < 2 or len(args) > 3:
+        print("Usage: python run_pipeline.py <deck.pptx> <work_dir> [openai|gemini] [--batch]")
+        sys.exit(1)
+    deck_file = args[0]
+    out_dir = args[1]
+    prov = args[2] if len(args)==3 else 'openai'
+    if use_batch and prov.lower() != 'openai':
+        print("--batch is only supported with the openai provider")
         sys.exit(1)
-    deck_file = sys.argv[1]
-    out_dir = sys.argv[2]
-    prov = sys.argv[3] if len(sys.argv)==4 else 'openai'
-    process_deck(deck_file, out_dir, prov)
\ No newline at end of file
+    asyncio.run(process_deck(deck_file, out_dir, prov, batch=use_batch))
\ No newline at end of file
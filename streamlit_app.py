@@ -1,21 +1,232 @@
 import streamlit as st
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import os
+import shutil
 import tempfile
+import threading
 import time
 from pathlib import Path
-import base64
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 from PIL import Image
 import io
+import math
+from aiolimiter import AsyncLimiter
+import xxhash
+import openai
 
 # Import pipeline functions
 from run_pipeline import (
+    start_unoserver,
+    stop_unoserver,
     pptx_to_pdf,
     pdf_to_images,
+    extract_text_bulk,
     extract_text,
-    summarize_openai,
-    summarize_gemini,
+    summarize_batch,
+    GeminiClient,
     load_keys,
+    MODEL_OPENAI,
+    SLIDE_BATCH_SIZE,
 )
 
+# Slides read, and batched requests sent, at the same time
+MAX_CONCURRENT_SLIDES = 8
+
+# Slide cards shown per page of results
+RESULTS_PER_PAGE = 10
+
+# Prompt instruction for each choice in the Summary Style box
+SUMMARY_INSTRUCTIONS = {
+    "Concise": "Provide a concise 2-3 sentence summary focusing on key points",
+    "Detailed": "Provide a detailed paragraph summarizing all important information",
+    "Bullet Points": "Provide a summary as 3-5 bullet points of the key takeaways",
+}
+
+# Working directories kept for recent uploads; older or idle ones are deleted
+MAX_DECK_WORKDIRS = 8
+DECK_WORKDIR_TTL = 3600  # seconds
+
+APP_CSS = Path(__file__).parent / "assets" / "app.css"
+
+@st.cache_data
+def load_css(path: Path) -> str:
+    """Read a stylesheet once per server process."""
+    return path.read_text()
+
+@st.cache_resource(show_spinner=False)
+def uno_server():
+    """One unoserver per Streamlit process, so conversions reuse a running LibreOffice."""
+    server = start_unoserver()
+    atexit.register(stop_unoserver)
+    return server
+
+@st.cache_resource(show_spinner=False)
+def deck_workdirs() -> tuple[Path, OrderedDict, threading.Lock]:
+    """Root directory for all sessions' deck working directories, removed at exit.
+
+    The OrderedDict maps upload hash to (directory, last use, runs using it),
+    least recently used first.
+    """
+    root = Path(tempfile.mkdtemp(prefix="slidesum_"))
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    return root, OrderedDict(), threading.Lock()
+
+@contextlib.contextmanager
+def workdir_for(file_hash: str) -> Iterator[Path]:
+    """The working directory for an uploaded deck, shared across reruns and sessions.
+
+    Only the MAX_DECK_WORKDIRS most recently used directories are kept, and none
+    idle for longer than DECK_WORKDIR_TTL; the others are deleted, except any
+    still open in another run.
+    """
+    root, workdirs, lock = deck_workdirs()
+    now = time.time()
+    with lock:
+        work_dir = root / file_hash
+        work_dir.mkdir(exist_ok=True)
+        _, _, in_use = workdirs.pop(file_hash, (work_dir, now, 0))
+        workdirs[file_hash] = (work_dir, now, in_use + 1)
+        kept = len(workdirs)
+        for key, (old_dir, last_used, users) in list(workdirs.items())[:-1]:
+            if users == 0 and (kept > MAX_DECK_WORKDIRS or now - last_used > DECK_WORKDIR_TTL):
+                del workdirs[key]
+                kept -= 1
+                shutil.rmtree(old_dir, ignore_errors=True)
+    try:
+        yield work_dir
+    finally:
+        with lock:
+            _, _, in_use = workdirs.pop(file_hash)
+            workdirs[file_hash] = (work_dir, time.time(), in_use - 1)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def convert_deck(file_hash: str, _file_bytes: bytes, filename: str) -> tuple[list[bytes], list[str]]:
+    """Convert an uploaded deck to one PNG per slide plus each page's PDF text layer.
+
+    Cached on the upload's content hash; the text is empty for pages without a
+    text layer.
+
+    The PDF and slide images stay in the deck's working directory, so a
+    recently used conversion evicted from this cache is rebuilt without
+    LibreOffice. Both are written under a .partial name and moved into place
+    once complete, so an interrupted conversion is never reused.
+    """
+    with workdir_for(file_hash) as work_dir:
+        pdf_file = work_dir / "pdf" / Path(filename).with_suffix(".pdf").name
+        if not pdf_file.exists():
+            ppt_path = work_dir / filename
+            ppt_path.write_bytes(_file_bytes)
+            partial_dir = work_dir / "pdf.partial"
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            partial_pdf = pptx_to_pdf(ppt_path, partial_dir)
+            pdf_file.parent.mkdir(exist_ok=True)
+            partial_pdf.replace(pdf_file)
+        
+        img_dir = work_dir / "images" / pdf_file.stem
+        if not img_dir.exists():
+            # Render next to the final directory and move it into place once complete
+            partial_dir = img_dir.with_name(img_dir.name + ".partial")
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            pdf_to_images(pdf_file, partial_dir)
+            partial_dir.rename(img_dir)
+        # The zero-padded slide_NNNN.png names sort in page order
+        slides = sorted(img_dir.glob("slide_*.png"))
+        text_layer = extract_text_bulk(pdf_file)[:len(slides)]
+        text_layer += [""] * (len(slides) - len(text_layer))
+        return [slide_img.read_bytes() for slide_img in slides], text_layer
+
+@st.cache_data(show_spinner=False)
+def extract_text_cached(png_bytes: bytes) -> str:
+    """OCR a slide image, cached on its content."""
+    return extract_text(io.BytesIO(png_bytes))
+
+# Clients are kept for the life of the server and shared by every rerun and
+# session using the same key; the full sha256 of the key keys the cache (a short
+# prefix could hand one user's client to another), the key itself is not hashed
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key_digest: str, _api_key: str) -> openai.OpenAI:
+    """Shared OpenAI client for a key."""
+    return openai.OpenAI(api_key=_api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_client(api_key_digest: str, _api_key: str, model_name: str) -> GeminiClient:
+    """Shared Gemini client for a key and model name."""
+    return GeminiClient.create(_api_key, model_name)
+
+class PartialSummaryError(Exception):
+    """A chunk in which some slides failed; summaries holds every slide's result."""
+
+    def __init__(self, summaries: list):
+        super().__init__(next(s for s in summaries if isinstance(s, Exception)))
+        self.summaries = summaries
+
+@st.cache_data(ttl=3600, max_entries=1024, show_spinner=False)
+def cached_summarize(texts: tuple[str, ...], provider: str, model: str, style: str, api_key_hash: str, _api_key: str, _on_summary=None, _before_request=None) -> list[str]:
+    """Summarize a chunk of slides, cached on their text and the summary settings.
+
+    The key itself is left out of the cache key (hence the underscore); api_key_hash
+    keeps different keys apart. Chunks with a failed slide raise PartialSummaryError,
+    so failures are retried on the next run instead of being cached. _on_summary is called with
+    each slide's summary as it streams in, and _before_request before every API
+    request; neither is called on a cache hit.
+    """
+    client_key = hashlib.sha256(_api_key.encode()).hexdigest()
+    if provider == "gemini":
+        client = get_gemini_client(client_key, _api_key, model)
+    else:
+        client = get_openai_client(client_key, _api_key)
+    summaries = summarize_batch(
+        list(texts), provider, client, on_summary=_on_summary, before_request=_before_request,
+        instruction=SUMMARY_INSTRUCTIONS[style]
+    )
+    if any(isinstance(summary, Exception) for summary in summaries):
+        raise PartialSummaryError(summaries)
+    return summaries
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_download(slides: tuple[tuple[int, str], ...]) -> str:
+    """Markdown of every (slide number, summary) pair, built once per set of results."""
+    return "\n\n".join(f"# Slide {slide_num}\n{summary}" for slide_num, summary in slides)
+
+def make_thumbnail(png_bytes: bytes) -> bytes:
+    """Downscale a slide image to a WEBP thumbnail."""
+    img = Image.open(io.BytesIO(png_bytes))
+    # Cheap integer box-filter shrink first, so thumbnail() only resamples a small
+    # image; after that bilinear is as sharp as LANCZOS at a fraction of the cost
+    img_thumb = img.reduce(max(1, img.width // 800))
+    img_thumb.thumbnail((800, 600), Image.BILINEAR)
+    buffered = io.BytesIO()
+    img_thumb.save(buffered, format="WEBP", quality=80, method=4)
+    return buffered.getvalue()
+
+def render_slide(result: dict, image: bytes) -> None:
+    """Show one slide's thumbnail, summary and extracted text."""
+    st.markdown(f"<div class='slide-container'>", unsafe_allow_html=True)
+    
+    # Create columns for image and text
+    img_col, text_col = st.columns([1, 2])
+    
+    with img_col:
+        if image:
+            st.image(image, width="stretch")
+        else:
+            st.markdown("*Image not available*")
+    
+    with text_col:
+        st.markdown(f"<div class='slide-header'>Slide {result['slide_num']}</div>", unsafe_allow_html=True)
+        st.markdown(result['summary'])
+        
+        # Expandable raw text
+        with st.expander("Show extracted text"):
+            st.text(result['raw_text'])
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
 # Page configuration with favicon and custom theme
 st.set_page_config(
     page_title="Slide Summarizer",
@@ -24,53 +235,16 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        margin-bottom: 0.5rem;
-    }
-    .subheader {
-        color: #888888;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-    }
-    .slide-container {
-        border: 1px solid #e6e6e6;
-        border-radius: 10px;
-        padding: 0.1rem;
-        margin-bottom: 1rem;
-        background-color: #f9f9f9;
-    }
-    .slide-header {
-        font-weight: bold;
-        margin-bottom: 0.5rem;
-    }
-    .provider-radio {
-        background-color: #f0f2f6;
-        padding: 0.1rem;
-        border-radius: 5px;
-        margin-bottom: 20px;
-    }
-    .stProgress > div > div > div > div {
-        background-color: #4CAF50;
-    }
-    .upload-section {
-        background-color: #f0f7ff;
-        
-        padding: 0.1rem;
-        border-radius: 10px;
-        margin-bottom: 20px;
-    }
-    .api-section {
-        background-color: #fff8f0;
-        padding: 0.1rem;
-        border-radius: 10px;
-        margin-bottom: 15px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Start LibreOffice in the background now so it is ready by the first upload
+uno_server()
+
+# Session defaults, set once per session rather than on every rerun
+for key, value in {"results": None, "images": None, "rpm": 60}.items():
+    st.session_state.setdefault(key, value)
+
+# Custom CSS for better styling; colors come from the theme in .streamlit/config.toml.
+# Streamlit drops elements a rerun doesn't emit, so the style tag is sent every run
+st.markdown(f"<style>{load_css(APP_CSS)}</style>", unsafe_allow_html=True)
 
 st.markdown("<div class='main-header'>📑 Slide Summarizer</div>", unsafe_allow_html=True)
 st.markdown("<div class='subheader'>Transform your presentations into concise summaries</div>", unsafe_allow_html=True)
@@ -111,7 +285,12 @@ with right_col:
     
     # Advanced options
     with st.expander("⚙️ Advanced Options"):
-        st.slider("Slide Processing Delay (seconds)", 0.0, 5.0, 1.0, 0.1, key="delay")
+        st.slider(
+            "Requests per Minute",
+            1, 500,
+            key="rpm",
+            help="Upper bound on API requests; raise it to match your provider's rate limit"
+        )
         
         if provider == "gemini":
             gemini_default = "models/gemini-2.5-flash-preview-04-17"
@@ -124,7 +303,7 @@ with right_col:
         # Summary style options
         summary_style = st.selectbox(
             "Summary Style",
-            ["Concise", "Detailed", "Bullet Points"],
+            list(SUMMARY_INSTRUCTIONS),
             index=0
         )
 
@@ -156,143 +335,200 @@ with left_col:
             valid_api_key = True
 
         if valid_api_key:
-            process_button = st.button("🚀 Summarize Slides", type="primary", use_container_width=True)
+            process_button = st.button("🚀 Summarize Slides", type="primary", width="stretch")
         else:
             st.warning(f"Please provide a {'OpenAI' if provider == 'openai' else 'Gemini'} API key in the Settings panel.")
-            process_button = st.button("🚀 Summarize Slides", type="primary", use_container_width=True, disabled=True)
+            process_button = st.button("🚀 Summarize Slides", type="primary", width="stretch", disabled=True)
     st.markdown("</div>", unsafe_allow_html=True)
     
     # Results area - will be populated after processing
-    if uploaded_file and 'results' not in st.session_state:
+    if uploaded_file and not st.session_state.results:
         st.markdown("### Results will appear here")
     
-    # Main processing logic
-    if uploaded_file and 'process_button' in locals() and process_button:
+    # Main processing logic, run as a fragment so its progress updates don't
+    # re-render the rest of the page
+    @st.fragment
+    def _process():
         # Initialize progress tracking
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        # Create temp working directory
-        with tempfile.TemporaryDirectory() as tmpdir:
-            work_dir = Path(tmpdir)
-            ppt_path = work_dir / uploaded_file.name
-            
-            # Save uploaded PPTX
-            status_text.text("Saving uploaded file...")
-            with open(ppt_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            progress_bar.progress(10)
-            
-            # Load keys (possibly overridden)
-            status_text.text("Loading API credentials...")
-            # Only use user-provided keys, not environment variables
-            if provider == "openai":
-                import openai
-                openai.api_key = openai_key_input
-                gemini_key = None
-                gemini_model = "models/gemini-2.5-flash-preview-04-17"
-            else:  # provider == "gemini"
-                import google.generativeai as genai
-                genai.configure(api_key=gemini_key_input)
-                gemini_key = gemini_key_input
-                gemini_model = gemini_model_input if 'gemini_model_input' in locals() else "models/gemini-2.5-flash-preview-04-17"
-            progress_bar.progress(20)
-            
-            # Convert to PDF
-            status_text.text("Converting PowerPoint to PDF...")
-            pdf_dir = work_dir / "pdf"
-            pdf_file = pptx_to_pdf(ppt_path, pdf_dir)
-            progress_bar.progress(30)
-            
-            # Convert PDF to images
-            status_text.text("Extracting slide images...")
-            img_dir = work_dir / "images"
-            slides = pdf_to_images(pdf_file, img_dir)
-            progress_bar.progress(40)
+        # Load keys (possibly overridden)
+        status_text.text("Loading API credentials...")
+        # Only use user-provided keys, not environment variables; the provider
+        # clients themselves are created once per key by get_*_client/model
+        if provider == "openai":
+            gemini_key = None
+            gemini_model = "models/gemini-2.5-flash-preview-04-17"
+        else:  # provider == "gemini"
+            gemini_key = gemini_key_input
+            gemini_model = gemini_model_input
+        progress_bar.progress(20)
+        
+        # Convert to PDF and then to slide images (cached per upload)
+        status_text.text("Converting PowerPoint to slide images...")
+        file_bytes = uploaded_file.getvalue()
+        slides, text_layer = convert_deck(hashlib.sha256(file_bytes).hexdigest(), file_bytes, uploaded_file.name)
+        progress_bar.progress(40)
+        
+        # Setting up for processing
+        total_slides = len(slides)
+        status_text.text(f"Processing {total_slides} slides...")
+        
+        # Slides are summarized concurrently; a token bucket keeps the API
+        # calls within the requests-per-minute setting
+        limiter = AsyncLimiter(st.session_state.rpm, 60)
+        
+        # Identifies the key in cached summaries without storing the key itself
+        api_key = gemini_key if provider == "gemini" else openai_key_input
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+        model = gemini_model if provider == "gemini" else MODEL_OPENAI
+        
+        async def process_slides():
+            sem = asyncio.Semaphore(MAX_CONCURRENT_SLIDES)
+            done = 0
             
-            # Setting up for processing
-            total_slides = len(slides)
-            status_text.text(f"Processing {total_slides} slides...")
+            async def read_slide(i, slide_img):
+                # Most slides carry a text layer; only image-only slides are OCR'd
+                if text_layer[i]:
+                    return text_layer[i]
+                async with sem:
+                    return await asyncio.to_thread(extract_text_cached, slide_img)
             
-            # Store results in session state
-            st.session_state.results = []
-            st.session_state.images = []
+            async def show_slide(i, raw_text, summary):
+                if isinstance(raw_text, Exception) or isinstance(summary, Exception):
+                    error = raw_text if isinstance(raw_text, Exception) else summary
+                    st.error(f"Error processing slide {i + 1}: {str(error)}")
+                    results[i] = {
+                        "slide_num": i + 1,
+                        "summary": f"Error: {str(error)}",
+                        "raw_text": raw_text if not isinstance(raw_text, Exception) else "Text extraction failed"
+                    }
+                else:
+                    results[i] = {
+                        "slide_num": i + 1,
+                        "summary": summary,
+                        "raw_text": raw_text
+                    }
+                
+                # Show the slide right away rather than after the whole deck
+                try:
+                    thumbnail = await asyncio.wrap_future(thumbnail_futures[i])
+                except Exception:
+                    thumbnail = None
+                with live_results:
+                    render_slide(results[i], thumbnail)
             
-            # Process each slide
-            for idx, slide_img in enumerate(sorted(slides), start=1):
-                current_progress = 40 + (idx / total_slides * 50)
-                progress_bar.progress(int(current_progress))
-                status_text.text(f"Processing slide {idx}/{total_slides}...")
+            async def summarize_chunk(groups):
+                nonlocal done
+                # Each group is the slides sharing one text; the first stands in for the rest
+                texts = ["" if isinstance(extracted[g[0]], Exception) else extracted[g[0]] for g in groups]
+                
+                async def show_group(offset, summary):
+                    for i in groups[offset]:
+                        await show_slide(i, extracted[i], summary)
+                
+                # Summaries streamed from the worker thread, ended by None
+                loop = asyncio.get_running_loop()
+                streamed = asyncio.Queue()
+                
+                def on_summary(offset, summary):
+                    loop.call_soon_threadsafe(streamed.put_nowait, (offset, summary))
                 
-                # Extract text and image
-                raw_text = extract_text(slide_img)
+                def before_request():
+                    # Each real API request waits for a token; cache hits never get here
+                    asyncio.run_coroutine_threadsafe(limiter.acquire(), loop).result()
                 
-                # Get summary based on provider and style
+                def summarize():
+                    try:
+                        return cached_summarize(
+                            tuple(texts), provider, model, summary_style, key_hash, api_key,
+                            on_summary, before_request
+                        )
+                    finally:
+                        loop.call_soon_threadsafe(streamed.put_nowait, None)
+                
+                shown = set()
                 try:
-                    # Adjust prompt based on style
-                    summary_prompt = raw_text
-                    if summary_style == "Concise":
-                        summary_instruction = "Provide a concise 2-3 sentence summary focusing on key points"
-                    elif summary_style == "Detailed":
-                        summary_instruction = "Provide a detailed paragraph summarizing all important information"
-                    else:  # Bullet Points
-                        summary_instruction = "Provide a summary as 3-5 bullet points of the key takeaways"
-                    
-                    # Get summary
-                    if provider == "gemini":
-                        if 'gemini_model_input' in locals():
-                            gemini_model = gemini_model_input
-                        summary = summarize_gemini(raw_text, gemini_key, gemini_model)
-                    else:
-                        summary = summarize_openai(raw_text)
-                    
-                    # Save thumbnail of the slide
-                    img = Image.open(slide_img)
-                    img_thumb = img.copy()
-                    img_thumb.thumbnail((800, 600))
-                    buffered = io.BytesIO()
-                    img_thumb.save(buffered, format="PNG")
-                    img_str = base64.b64encode(buffered.getvalue()).decode()
-                    
-                    # Store results
-                    st.session_state.results.append({
-                        "slide_num": idx,
-                        "summary": summary,
-                        "raw_text": raw_text
-                    })
-                    st.session_state.images.append(img_str)
-                    
+                    # Get summaries for the whole chunk in one request, or from the cache
+                    async with sem:
+                        task = asyncio.create_task(asyncio.to_thread(summarize))
+                        while (item := await streamed.get()) is not None:
+                            offset, summary = item
+                            if offset not in shown:
+                                shown.add(offset)
+                                await show_group(offset, summary)
+                        summaries = await task
+                except PartialSummaryError as e:
+                    # Only the slides that failed show the error
+                    summaries = e.summaries
                 except Exception as e:
-                    st.error(f"Error processing slide {idx}: {str(e)}")
-                    st.session_state.results.append({
-                        "slide_num": idx,
-                        "summary": f"Error: {str(e)}",
-                        "raw_text": raw_text if 'raw_text' in locals() else "Text extraction failed"
-                    })
-                    st.session_state.images.append(None)
+                    summaries = [e] * len(texts)
                 
-                # Add delay between API calls
-                time.sleep(st.session_state.delay)
+                for offset, summary in enumerate(summaries):
+                    if offset not in shown:
+                        await show_group(offset, summary)
+                    elif not isinstance(summary, Exception):
+                        for i in groups[offset]:
+                            results[i]["summary"] = summary
+                
+                done += sum(len(g) for g in groups)
+                progress_bar.progress(int(40 + done / total_slides * 50))
+                status_text.text(f"Processed {done}/{total_slides} slides...")
+            
+            extracted = await asyncio.gather(*(read_slide(i, slide_img) for i, slide_img in enumerate(slides)), return_exceptions=True)
+            results = [None] * total_slides
             
-            # Complete progress
-            progress_bar.progress(100)
-            status_text.text("Processing complete!")
-            time.sleep(0.5)
-            status_text.empty()
-            progress_bar.empty()
+            # Repeated slides (section dividers, agendas, "Thank you") are
+            # summarized once and the summary is shared by every copy
+            slides_by_text = {}
+            for i, raw_text in enumerate(extracted):
+                if isinstance(raw_text, Exception):
+                    slides_by_text[("error", i)] = [i]
+                else:
+                    slides_by_text.setdefault(xxhash.xxh64(raw_text.encode()).hexdigest(), []).append(i)
+            groups = list(slides_by_text.values())
             
-            # Trigger page refresh to show results
-            st.rerun()
+            # Batch the unique texts, SLIDE_BATCH_SIZE per request
+            await asyncio.gather(*(
+                summarize_chunk(groups[start:start + SLIDE_BATCH_SIZE])
+                for start in range(0, len(groups), SLIDE_BATCH_SIZE)
+            ))
+            return results
+        
+        # Slides appear here as they are summarized, until the full results replace them
+        live_placeholder = st.empty()
+        live_results = live_placeholder.container()
+        
+        # Thumbnails are built on their own threads while slides are read and summarized
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as thumbnail_pool:
+            thumbnail_futures = [thumbnail_pool.submit(make_thumbnail, slide_img) for slide_img in slides]
+            
+            # Store results in session state, starting again from the first page
+            st.session_state.pop("results_page", None)
+            st.session_state.results = asyncio.run(process_slides())
+            st.session_state.images = [
+                future.result() if future.exception() is None else None
+                for future in thumbnail_futures
+            ]
+        
+        # Complete progress
+        progress_bar.progress(100)
+        status_text.text("Processing complete!")
+        time.sleep(0.5)
+        status_text.empty()
+        progress_bar.empty()
+        live_placeholder.empty()
+    
+    if uploaded_file and 'process_button' in locals() and process_button:
+        _process()
 
 # Display results if available
-if 'results' in st.session_state and len(st.session_state.results) > 0:
+if st.session_state.results:
     st.markdown("## Slide Summaries")
     
     # Add download button for all summaries
-    all_summaries = "\n\n".join([
-        f"# Slide {r['slide_num']}\n{r['summary']}" 
-        for r in st.session_state.results
-    ])
+    all_summaries = build_download(tuple((r['slide_num'], r['summary']) for r in st.session_state.results))
     
     st.download_button(
         label="📥 Download All Summaries",
@@ -301,33 +537,23 @@ if 'results' in st.session_state and len(st.session_state.results) > 0:
         mime="text/markdown",
     )
     
-    # Display each slide with its summary
-    for i, result in enumerate(st.session_state.results):
-        st.markdown(f"<div class='slide-container'>", unsafe_allow_html=True)
-        
-        # Create columns for image and text
-        img_col, text_col = st.columns([1, 2])
-        
-        with img_col:
-            if st.session_state.images[i]:
-                st.markdown(f"<img src='data:image/png;base64,{st.session_state.images[i]}' width='100%'>", unsafe_allow_html=True)
-            else:
-                st.markdown("*Image not available*")
-        
-        with text_col:
-            st.markdown(f"<div class='slide-header'>Slide {result['slide_num']}</div>", unsafe_allow_html=True)
-            st.markdown(result['summary'])
-            
-            # Expandable raw text
-            with st.expander("Show extracted text"):
-                st.text(result['raw_text'])
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+    # Display one page of slides with their summaries; paging only reruns this fragment
+    @st.fragment
+    def _render_results():
+        results = st.session_state.results
+        pages = math.ceil(len(results) / RESULTS_PER_PAGE)
+        page = st.number_input("Page", 1, pages, key="results_page") if pages > 1 else 1
+        start = (page - 1) * RESULTS_PER_PAGE
+        for result, image in zip(results[start:start + RESULTS_PER_PAGE], st.session_state.images[start:start + RESULTS_PER_PAGE]):
+            render_slide(result, image)
+    
+    _render_results()
     
     # Add option to clear results and start over
     if st.button("Clear Results & Start Over"):
-        del st.session_state.results
-        del st.session_state.images
+        st.session_state.results = None
+        st.session_state.images = None
+        st.session_state.pop("results_page", None)
         st.rerun()
 
 # Footer